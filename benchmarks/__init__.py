@@ -0,0 +1,28 @@
+import timeit
+import typing as ty
+
+BENCHMARKS: ty.Dict[str, ty.Callable[..., None]] = {}
+
+
+def benchmark(func):
+    def w(banner=True):
+        if banner:
+            print("-" * 80)
+            print(func.__name__)
+            print("-" * 80)
+        func()
+        if banner:
+            print()
+
+    BENCHMARKS[func.__name__] = w
+    return w
+
+
+def measure(func: ty.Callable[[], ty.Any], *, number: int = 10000, repeat: int = 5) -> float:
+    """Return the best observed per-call time of `func`, in seconds."""
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def report(label: str, seconds: float):
+    print("{:<48} {:>10.2f} us/op {:>12.0f} ops/s".format(label, seconds * 1e6, 1 / seconds))
@@ -0,0 +1,33 @@
+import sys
+from pathlib import Path
+
+# add the local lib to sys.path for discovery
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from . import BENCHMARKS
+
+# basically import for side-effects; the decorator `benchmark`
+# registers the functions into the BENCHMARKS dict
+from .formatter import *
+from .runtime_checks import *
+from .serialize import *
+from .series import *
+from .source import *
+
+
+def list_benchmarks():
+    for k in BENCHMARKS.keys():
+        print(k)
+
+
+if len(sys.argv) >= 2:
+    # user wanted a specific benchmark, or listing
+    name = sys.argv[1]
+    if name in BENCHMARKS.keys():
+        BENCHMARKS[name](banner=False)
+    elif name == "list":
+        list_benchmarks()
+else:
+    # run all benchmarks
+    for v in BENCHMARKS.values():
+        v()
@@ -0,0 +1,15 @@
+from ocptv.output import Writer
+
+
+class NullWriter(Writer):
+    """Writer that discards all output, so that only the library cost is measured."""
+
+    def write(self, buffer: str):
+        pass
+
+
+class NullBytesWriter(NullWriter):
+    """Same as ``NullWriter``, but takes the bytes output path."""
+
+    def write_bytes(self, buffer: bytes):
+        pass
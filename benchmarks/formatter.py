@@ -0,0 +1,23 @@
+import itertools
+import time
+
+from ocptv.formatter import TimestampFormatter, format_timestamp
+
+from . import benchmark, measure, report
+
+
+@benchmark
+def bench_format_timestamp():
+    """
+    Timestamp formatting cost of ``format_timestamp`` against the cached ``TimestampFormatter``,
+    both for timestamps inside the same second and for a new second on every call.
+    """
+
+    ts = time.time()
+    formatter = TimestampFormatter()
+
+    report("format_timestamp", measure(lambda: format_timestamp(ts)))
+    report("TimestampFormatter, same second", measure(lambda: formatter.format(ts)))
+
+    seconds = itertools.count(int(ts))
+    report("TimestampFormatter, new second", measure(lambda: formatter.format(next(seconds) + 0.5)))
@@ -0,0 +1,57 @@
+from ocptv.output import objects as spec
+from ocptv.output.config import get_config
+from ocptv.output.runtime_checks import _check_type_any
+
+from . import benchmark, measure, report
+
+
+def _make_measurement_artifact() -> spec.Root:
+    hardware = spec.HardwareInfo(
+        id="dut0_0",
+        name="fan0",
+        version=None,
+        revision=None,
+        location="MB/FAN0",
+        serial_no=None,
+        part_no=None,
+        manufacturer=None,
+        manufacturer_part_no=None,
+        odata_id=None,
+        computer_system=None,
+        manager=None,
+    )
+    validator = spec.Validator(name="gt_1000", type=spec.ValidatorType.GREATER_THAN, value=1000, metadata=None)
+    measurement = spec.Measurement(
+        name="fan_speed",
+        value=1200,
+        unit="rpm",
+        validators=[validator],
+        hardware_info=hardware,
+        subcomponent=None,
+        metadata=spec.Metadata({"sensor": "tach0"}),
+    )
+    return spec.Root(
+        impl=spec.StepArtifact(id="0", impl=measurement),
+        sequence_number=0,
+        timestamp=0.0,
+    )
+
+
+@benchmark
+def bench_runtime_checks():
+    """
+    Cost of constructing a measurement artifact, including all the nested spec objects,
+    with and without the runtime type checks.
+    The uncompiled checker walking the whole object tree is shown for reference.
+    """
+    root = _make_measurement_artifact()
+    report("uncompiled check, full tree", measure(lambda: _check_type_any(root, spec.Root, trace=[])))
+
+    config = get_config()
+    try:
+        report("construct, checks enabled", measure(_make_measurement_artifact))
+
+        config.enable_runtime_checks = False
+        report("construct, checks disabled", measure(_make_measurement_artifact))
+    finally:
+        config.enable_runtime_checks = True
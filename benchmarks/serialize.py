@@ -0,0 +1,177 @@
+import time
+import typing as ty
+
+from ocptv.output import FastJsonEncoder, JsonEncoder
+from ocptv.output import objects as spec
+from ocptv.output.emit import ArtifactEmitter
+
+from . import benchmark, measure, report
+from .common import NullBytesWriter, NullWriter
+
+
+def _spec_artifacts() -> ty.Dict[str, spec.RootArtifactType]:
+    hardware = spec.HardwareInfo(
+        id="dut0_0",
+        name="fan0",
+        version="1",
+        revision="2",
+        location="MB/FAN0",
+        serial_no="SN0",
+        part_no="PN0",
+        manufacturer="acme",
+        manufacturer_part_no="APN0",
+        odata_id="/redfish/v1/Chassis/1/Thermal#/Fans/0",
+        computer_system="primary_node",
+        manager="bmc0",
+    )
+    software = spec.SoftwareInfo(
+        id="dut0_0",
+        name="bmc_firmware",
+        version="1.0",
+        revision="2",
+        type=spec.SoftwareType.FIRMWARE,
+        computer_system="bmc0",
+    )
+    subcomponent = spec.Subcomponent(
+        type=spec.SubcomponentType.ASIC,
+        name="fan_controller",
+        location="FAN0/U1",
+        version="1",
+        revision="1",
+    )
+    validator = spec.Validator(
+        name="gt_1000",
+        type=spec.ValidatorType.GREATER_THAN,
+        value=1000,
+        metadata=None,
+    )
+    source = spec.SourceLocation(file="diag.py", line=42)
+    metadata = spec.Metadata({"sensor": "tach0"})
+
+    dut_info = spec.DutInfo(
+        id="dut0",
+        name="host0",
+        platform_infos=[spec.PlatformInfo(info="memory")],
+        software_infos=[software],
+        hardware_infos=[hardware],
+        metadata=None,
+    )
+
+    def step(impl) -> spec.StepArtifact:
+        return spec.StepArtifact(id="0", impl=impl)
+
+    return {
+        "schemaVersion": spec.SchemaVersion(),
+        "testRunStart": spec.RunArtifact(
+            impl=spec.RunStart(
+                name="bench",
+                version="1.0",
+                command_line="--bench",
+                parameters={"param": "value"},
+                dut_info=dut_info,
+            )
+        ),
+        "testRunEnd": spec.RunArtifact(
+            impl=spec.RunEnd(status=spec.TestStatus.COMPLETE, result=spec.TestResult.PASS),
+        ),
+        "log (run)": spec.RunArtifact(
+            impl=spec.Log(severity=spec.LogSeverity.INFO, message="message", source_location=source),
+        ),
+        "error (run)": spec.RunArtifact(
+            impl=spec.Error(symptom="symptom", message="message", software_infos=[software], source_location=source),
+        ),
+        "testStepStart": step(spec.StepStart(name="step0")),
+        "testStepEnd": step(spec.StepEnd(status=spec.TestStatus.COMPLETE)),
+        "measurement": step(
+            spec.Measurement(
+                name="fan_speed",
+                value=1200,
+                unit="rpm",
+                validators=[validator],
+                hardware_info=hardware,
+                subcomponent=subcomponent,
+                metadata=metadata,
+            )
+        ),
+        "measurementSeriesStart": step(
+            spec.MeasurementSeriesStart(
+                name="fan_speed",
+                unit="rpm",
+                series_id="0_0",
+                validators=[validator],
+                hardware_info=hardware,
+                subcomponent=subcomponent,
+                metadata=metadata,
+            )
+        ),
+        "measurementSeriesElement": step(
+            spec.MeasurementSeriesElement(
+                index=0,
+                value=1200,
+                timestamp=time.time(),
+                series_id="0_0",
+                metadata=None,
+            )
+        ),
+        "measurementSeriesEnd": step(spec.MeasurementSeriesEnd(series_id="0_0", total_count=1)),
+        "diagnosis": step(
+            spec.Diagnosis(
+                verdict="fan_ok",
+                type=spec.DiagnosisType.PASS,
+                message="message",
+                hardware_info=hardware,
+                subcomponent=subcomponent,
+                source_location=source,
+            )
+        ),
+        "log (step)": step(spec.Log(severity=spec.LogSeverity.DEBUG, message="message", source_location=source)),
+        "error (step)": step(
+            spec.Error(symptom="symptom", message="message", software_infos=[software], source_location=source)
+        ),
+        "file": step(
+            spec.File(
+                name="dump",
+                uri="file:///tmp/dump",
+                is_snapshot=False,
+                description="description",
+                content_type="text/plain",
+                metadata=metadata,
+            )
+        ),
+        "extension": step(spec.Extension(name="ext", content={"key": [1, 2, {"nested": True}]})),
+    }
+
+
+@benchmark
+def bench_serialize_artifacts():
+    """
+    Per-artifact serialization cost for every root artifact type in the spec models.
+    Only the serialization is measured, not the dataclass construction.
+    """
+
+    emitter = ArtifactEmitter(NullWriter())
+    for name, artifact in _spec_artifacts().items():
+        root = spec.Root(impl=artifact, sequence_number=1, timestamp=time.time())
+        report(name, measure(lambda: emitter._serialize(root)))
+
+
+@benchmark
+def bench_encoders():
+    """
+    Serialization cost of a measurement artifact for each of the encoder backends,
+    for both the str and the bytes output paths.
+    """
+
+    root = spec.Root(impl=_spec_artifacts()["measurement"], sequence_number=1, timestamp=time.time())
+    encoders = [
+        ("json", JsonEncoder()),
+        ("json compact", JsonEncoder(compact=True)),
+        ("fast ({})".format(FastJsonEncoder().backend), FastJsonEncoder()),
+    ]
+
+    for name, encoder in encoders:
+        emitter = ArtifactEmitter(NullWriter(), encoder=encoder)
+        report("{} str".format(name), measure(lambda: emitter._write(root)))
+
+        emitter = ArtifactEmitter(NullBytesWriter(), encoder=encoder)
+        report("{} bytes".format(name), measure(lambda: emitter._write(root)))
@@ -0,0 +1,46 @@
+import itertools
+import time
+
+import ocptv.output as tv
+from ocptv.output.objects import MeasurementSeriesElement
+
+from . import benchmark, measure, report
+from .common import NullWriter
+
+
+@benchmark
+def bench_series_elements():
+    """
+    Throughput of measurement series element emission, comparing the templated path used by
+    ``MeasurementSeries.add_measurement`` with emitting the same element through the spec objects.
+    """
+
+    tv.config(writer=NullWriter())
+    try:
+        run = tv.TestRun(name="bench", version="1.0")
+        run.start(dut=tv.Dut(id="dut0"))
+        step = run.add_step("step0")
+        step.start()
+        series = step.start_measurement_series(name="fan_speed", unit="rpm")
+
+        index = itertools.count()
+
+        def spec_objects():
+            element = MeasurementSeriesElement(
+                index=next(index),
+                value=1200.5,
+                timestamp=time.time(),
+                series_id="0_0",
+                metadata=None,
+            )
+            series._emitter.emit_impl(element)
+
+        spec = measure(spec_objects)
+        report("spec objects", spec)
+
+        templated = measure(lambda: series.add_measurement(value=1200.5))
+        report("templated", templated)
+
+        print("speedup: {:.1f}x".format(spec / templated))
+    finally:
+        tv.config(writer=tv.StdoutWriter())
@@ -0,0 +1,41 @@
+import traceback
+
+import ocptv.output as tv
+from ocptv.output import LogSeverity
+from ocptv.output.source import get_caller_source
+
+from . import benchmark, measure, report
+from .common import NullWriter
+
+
+@benchmark
+def bench_caller_source():
+    """
+    Cost of the caller source location capture, and of logging with or without it.
+    The full stack extraction is shown for reference, as the previous way of finding the caller.
+    """
+
+    def lib_function():
+        return get_caller_source()
+
+    report("traceback.extract_stack", measure(lambda: traceback.extract_stack()))
+    report("get_caller_source", measure(lib_function))
+
+    for policy in (tv.SourceLocationPolicy.ALWAYS, tv.SourceLocationPolicy.ERRORS_ONLY):
+        tv.config(writer=NullWriter(), source_location=policy)
+        try:
+            run = tv.TestRun(name="bench", version="1.0")
+            run.start(dut=tv.Dut(id="dut0"))
+
+            report(f"add_log, {policy!r}", measure(lambda: run.add_log(LogSeverity.DEBUG, "message")))
+        finally:
+            tv.config(writer=tv.StdoutWriter(), source_location=tv.SourceLocationPolicy.ALWAYS)
+
+    tv.config(writer=NullWriter())
+    try:
+        run = tv.TestRun(name="bench", version="1.0")
+        run.start(dut=tv.Dut(id="dut0"))
+
+        report("add_log, no source", measure(lambda: run.add_log(LogSeverity.DEBUG, "message", source_location=None)))
+    finally:
+        tv.config(writer=tv.StdoutWriter())
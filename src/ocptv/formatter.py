@@ -1,3 +1,5 @@
+import math
+import threading
 import typing as ty
 from datetime import datetime, timezone, tzinfo
 from enum import Enum
@@ -20,3 +22,63 @@ def format_timestamp(ts: float, tz: ty.Optional[tzinfo] = timezone.utc) -> str:
     if isostr.endswith(utcsuffix):
         return isostr[: -len(utcsuffix)] + "Z"
     return isostr
+
+
+class TimestampFormatter:
+    """
+    Same output as ``format_timestamp`` for a fixed timezone, but caches the formatted
+    date/time and offset parts for the last seen second. Timestamps inside the same second
+    then only need the fractional part to be rendered.
+    This type is threadsafe.
+    """
+
+    def __init__(self, tz: ty.Optional[tzinfo] = timezone.utc):
+        self._tz = tz
+        # (second, date/time prefix, offset suffix); replaced as a whole, so readers
+        # never see a partially updated cache
+        self._cache: ty.Tuple[ty.Optional[int], str, str] = (None, "", "")
+
+    def format(self, ts: float) -> str:
+        frac, whole = math.modf(ts)
+        second = int(whole)
+        # same rounding as datetime.fromtimestamp (round half even, to microseconds)
+        micros = round(frac * 1e6)
+        if micros < 0:
+            second -= 1
+            micros += 1000000
+        elif micros >= 1000000:
+            second += 1
+            micros -= 1000000
+
+        cached_second, prefix, suffix = self._cache
+        if second != cached_second:
+            prefix, suffix = self._render(second)
+            self._cache = (second, prefix, suffix)
+
+        if micros:
+            return "%s.%06d%s" % (prefix, micros, suffix)
+        return prefix + suffix
+
+    def _render(self, second: int) -> ty.Tuple[str, str]:
+        isostr = datetime.fromtimestamp(second, timezone.utc).astimezone(self._tz).isoformat()
+
+        # isoformat without microseconds is "YYYY-MM-DDTHH:MM:SS" followed by the utc offset
+        prefix, suffix = isostr[:19], isostr[19:]
+        if suffix == "+00:00":
+            suffix = "Z"
+        return prefix, suffix
+
+
+_formatters_lock = threading.Lock()
+_formatters: ty.Dict[ty.Optional[tzinfo], TimestampFormatter] = {}
+
+
+def get_timestamp_formatter(tz: ty.Optional[tzinfo] = timezone.utc) -> TimestampFormatter:
+    """
+    Get the shared cached timestamp formatter for the given timezone.
+    """
+    formatter = _formatters.get(tz, None)
+    if formatter is None:
+        with _formatters_lock:
+            formatter = _formatters.setdefault(tz, TimestampFormatter(tz))
+    return formatter
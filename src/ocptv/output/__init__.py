@@ -1,6 +1,13 @@
 # following are the only public api exports
-from .config import StdoutWriter, Writer, config
+from .config import (
+    RuntimeCheckPolicy,
+    SourceLocationPolicy,
+    StdoutWriter,
+    Writer,
+    config,
+)
 from .dut import Dut, Subcomponent
+from .encoder import Encoder, FastJsonEncoder, JsonEncoder
 from .measurement import Validator
 from .objects import (
     DiagnosisType,
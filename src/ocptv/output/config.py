@@ -2,6 +2,7 @@
 This module contains output channel configuration for the OCPTV library.
 """
 
+import itertools
 import threading
 import typing as ty
 from abc import ABC, abstractmethod
@@ -9,6 +10,8 @@ from datetime import timezone, tzinfo
 
 from ocptv.api import export_api
 
+from .encoder import Encoder, JsonEncoder
+
 
 class Writer(ABC):  # pragma: no cover
     """
@@ -21,6 +24,14 @@ class Writer(ABC):  # pragma: no cover
     def write(self, buffer: str):
         pass
 
+    def write_bytes(self, buffer: bytes):
+        """
+        Optional bytes output path. The buffer is the utf-8 encoded JSON of a single artifact.
+        Writers that output to binary streams or file descriptors should override this, in which
+        case the library will use it instead of ``write`` and skip the str/bytes conversions.
+        """
+        self.write(buffer.decode("utf-8"))
+
 
 @export_api
 class StdoutWriter(Writer):
@@ -36,6 +47,156 @@ class StdoutWriter(Writer):
             print(buffer)
 
 
+@export_api
+class SourceLocationPolicy:
+    """
+    The ``SourceLocationPolicy`` determines when the library should capture the caller
+    source location, for the artifacts produced with ``source_location=SourceLocation.CALLER``.
+    Capturing the location needs a walk of the call stack, which may become noticeable
+    for code emitting lots of log entries in tight loops.
+
+    Explicitly provided ``SourceLocation`` values are always used, regardless of policy.
+
+    Usage:
+
+    .. code-block:: python
+
+        import ocptv.output as tv
+        tv.config(source_location=tv.SourceLocationPolicy.ERRORS_ONLY)
+
+    Available policies:
+    - ``ALWAYS``: always capture the caller source location; this is the library default.
+    - ``NEVER``: never capture the caller source location.
+    - ``ERRORS_ONLY``: only capture for errors, diagnoses and ERROR or FATAL log entries.
+    - ``sampled(n)``: capture for one in every ``n`` calls.
+    """
+
+    ALWAYS: "SourceLocationPolicy"
+    NEVER: "SourceLocationPolicy"
+    ERRORS_ONLY: "SourceLocationPolicy"
+
+    def __init__(self, name: str, capture: ty.Callable[[bool], bool]):
+        """
+        Internal usage. Use the class attributes or ``sampled()`` instead.
+
+        :meta private:
+        """
+        self._name = name
+        self._capture = capture
+
+    @classmethod
+    def sampled(cls, n: int) -> "SourceLocationPolicy":
+        """
+        Make a policy that captures the caller source location for the first and then
+        one in every ``n`` calls, counted across all the artifact types.
+
+        :param n: sampling interval, must be a positive integer.
+        """
+        if n < 1:
+            raise ValueError(f"sampling interval must be a positive integer, got {n}")
+
+        # note: next() on the counter is atomic, so this is safe to share between threads
+        counter = itertools.count()
+        return cls(f"sampled({n})", lambda _: next(counter) % n == 0)
+
+    def capture(self, is_error: bool) -> bool:
+        """
+        Internal usage. Decide whether the caller source location should be captured.
+
+        :meta private:
+        """
+        return self._capture(is_error)
+
+    def __repr__(self) -> str:
+        return f"SourceLocationPolicy.{self._name}"
+
+
+SourceLocationPolicy.ALWAYS = SourceLocationPolicy("ALWAYS", lambda _: True)
+SourceLocationPolicy.NEVER = SourceLocationPolicy("NEVER", lambda _: False)
+SourceLocationPolicy.ERRORS_ONLY = SourceLocationPolicy("ERRORS_ONLY", lambda is_error: is_error)
+
+
+@export_api
+class RuntimeCheckPolicy:
+    """
+    The ``RuntimeCheckPolicy`` determines when the runtime type checks are done, if enabled.
+    Checking every object on construction is the safest option, but it has a cost for
+    code producing lots of artifacts.
+
+    Usage:
+
+    .. code-block:: python
+
+        import ocptv.output as tv
+        tv.config(runtime_checks=tv.RuntimeCheckPolicy.sampled(first=100, every=10))
+
+    Available policies:
+    - ``FULL``: check every object on construction; this is the library default.
+    - ``DEFERRED``: check the emitted artifacts on a background thread. Failures are reported
+      as test run error artifacts, after the offending artifact was already output.
+      Checks are skipped if the background thread cannot keep up.
+    - ``sampled(first, every)``: check the first objects of each type on construction,
+      then one in every ``every``.
+    """
+
+    FULL: "RuntimeCheckPolicy"
+    DEFERRED: "RuntimeCheckPolicy"
+
+    def __init__(self, name: str, check: ty.Callable[[type], bool], *, deferred: bool = False):
+        """
+        Internal usage. Use the class attributes or ``sampled()`` instead.
+
+        :meta private:
+        """
+        self._name = name
+        self._check = check
+        self._deferred = deferred
+
+    @classmethod
+    def sampled(cls, *, first: int, every: int) -> "RuntimeCheckPolicy":
+        """
+        Make a policy that checks the first objects of each type, then one in every ``every``.
+
+        :param first: number of objects of each type that are always checked.
+        :param every: sampling interval after the first objects, must be a positive integer.
+        """
+        if first < 0 or every < 1:
+            raise ValueError(f"invalid sampling parameters, got first={first}, every={every}")
+
+        # note: setdefault and next() on the counters are atomic, so this is safe to share between threads
+        counters: ty.Dict[type, ty.Iterator[int]] = {}
+
+        def check(cls: type) -> bool:
+            n = next(counters.setdefault(cls, itertools.count()))
+            return n < first or n % every == 0
+
+        return cls(f"sampled(first={first}, every={every})", check)
+
+    def check(self, cls: type) -> bool:
+        """
+        Internal usage. Decide whether an object of the given type should be checked on construction.
+
+        :meta private:
+        """
+        return self._check(cls)
+
+    @property
+    def deferred(self) -> bool:
+        """
+        Internal usage. True if the emitted artifacts should be checked on a background thread.
+
+        :meta private:
+        """
+        return self._deferred
+
+    def __repr__(self) -> str:
+        return f"RuntimeCheckPolicy.{self._name}"
+
+
+RuntimeCheckPolicy.FULL = RuntimeCheckPolicy("FULL", lambda _: True)
+RuntimeCheckPolicy.DEFERRED = RuntimeCheckPolicy("DEFERRED", lambda _: False, deferred=True)
+
+
 class Config:
     """
     Thread safe storage for module configuration.
@@ -49,8 +210,11 @@ class Config:
     def __init__(self):
         self._lock = threading.Lock()
         self._writer: Writer = StdoutWriter()
+        self._encoder: Encoder = JsonEncoder()
         self._enable_runtime_checks = True
+        self._runtime_checks = RuntimeCheckPolicy.FULL
         self._tzinfo: ty.Union[tzinfo, None] = timezone.utc
+        self._source_location = SourceLocationPolicy.ALWAYS
 
     @property
     def writer(self) -> Writer:
@@ -62,6 +226,16 @@ class Config:
         with self._lock:
             self._writer = writer
 
+    @property
+    def encoder(self) -> Encoder:
+        with self._lock:
+            return self._encoder
+
+    @encoder.setter
+    def encoder(self, encoder: Encoder):
+        with self._lock:
+            self._encoder = encoder
+
     @property
     def enable_runtime_checks(self) -> bool:
         with self._lock:
@@ -72,6 +246,16 @@ class Config:
         with self._lock:
             self._enable_runtime_checks = enable
 
+    @property
+    def runtime_checks(self) -> RuntimeCheckPolicy:
+        with self._lock:
+            return self._runtime_checks
+
+    @runtime_checks.setter
+    def runtime_checks(self, policy: RuntimeCheckPolicy):
+        with self._lock:
+            self._runtime_checks = policy
+
     @property
     def timezone(self) -> ty.Union[tzinfo, None]:
         with self._lock:
@@ -82,6 +266,16 @@ class Config:
         with self._lock:
             self._tzinfo = tzinfo
 
+    @property
+    def source_location(self) -> SourceLocationPolicy:
+        with self._lock:
+            return self._source_location
+
+    @source_location.setter
+    def source_location(self, policy: SourceLocationPolicy):
+        with self._lock:
+            self._source_location = policy
+
 
 # module scoped configuration (similar to python logging)
 _config: Config = Config()
@@ -100,29 +294,47 @@ else:
 def config(
     *,
     writer: ty.Optional[Writer] = None,
+    encoder: ty.Optional[Encoder] = None,
     enable_runtime_checks: ty.Optional[bool] = None,
+    runtime_checks: ty.Optional[RuntimeCheckPolicy] = None,
     timezone: ty.Union[tzinfo, None] = _NOT_SET,
+    source_location: ty.Optional[SourceLocationPolicy] = None,
 ):
     """
     Configure how the ocptv.output lib behaves.
 
     :param writer: if provided, set the output channel writer.
+    :param encoder: if provided, set the JSON encoder backend used for the output.
+        The library default is ``JsonEncoder()``, which uses the stdlib ``json`` module.
     :param enable_runtime_checks: if provided, enables or disables runtime type checks.
+    :param runtime_checks: if provided, sets the policy for when the runtime type checks are done,
+        if enabled. The library default is ``RuntimeCheckPolicy.FULL``.
     :param timezone: if provided, sets the timezone for the output formatted datetime fields.
         Use `None` to automatically determine the local system timezone.
         The library default, if never configured, is UTC.
+    :param source_location: if provided, sets the policy for capturing the caller source location
+        in logs, errors and diagnoses. The library default is ``SourceLocationPolicy.ALWAYS``.
     """
     global _config
 
     if writer is not None:
         _config.writer = writer
 
+    if encoder is not None:
+        _config.encoder = encoder
+
     if enable_runtime_checks is not None:
         _config.enable_runtime_checks = enable_runtime_checks
 
+    if runtime_checks is not None:
+        _config.runtime_checks = runtime_checks
+
     if timezone is not _NOT_SET:
         _config.timezone = timezone
 
+    if source_location is not None:
+        _config.source_location = source_location
+
 
 def get_config() -> Config:
     """
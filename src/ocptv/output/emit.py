@@ -3,17 +3,28 @@ This module covers the raw output semantics of the OCPTV library.
 """
 
 import dataclasses as dc
-import json
+import math
 import threading
 import time
 import typing as ty
+from datetime import tzinfo
 from enum import Enum
 
-from .config import Writer
-from .objects import ArtifactType, Root, RootArtifactType, SchemaVersion
+from ocptv.formatter import get_timestamp_formatter
 
-Primitive = ty.Union[float, int, bool, str, None]
-JSON = ty.Union[ty.Dict[str, "JSON"], ty.List["JSON"], Primitive]
+from .config import _NOT_SET, Writer, get_config
+from .encoder import JSON, Encoder, JsonEncoder, Primitive
+from .objects import (
+    ArtifactType,
+    Error,
+    Root,
+    RootArtifactType,
+    RunArtifact,
+    SchemaVersion,
+    StepArtifact,
+    format_timestamp_with_tzinfo,
+)
+from .runtime_checks import DeferredChecker, TypeCheckError
 
 
 def _is_optional(field: ty.Type):
@@ -24,80 +35,329 @@ def _is_optional(field: ty.Type):
     return field == ty.Optional[field]
 
 
+# value types that can be handed to the json encoder as-is
+_PRIMITIVE_TYPES = frozenset([str, float, int, bool])
+
+
+class _FieldKind(Enum):
+    """Nested value kind for a field, as derived from its type hint."""
+
+    PRIMITIVE = 0
+    OBJECT = 1
+    ANY = 2
+
+
+def _field_kind(hint: ty.Any) -> _FieldKind:
+    args = getattr(hint, "__args__", None) if getattr(hint, "__origin__", None) is ty.Union else (hint,)
+    types = [t for t in args or () if t is not type(None)]
+
+    if types and all(t in _PRIMITIVE_TYPES for t in types):
+        return _FieldKind.PRIMITIVE
+    if types and all(isinstance(t, type) and dc.is_dataclass(t) for t in types):
+        return _FieldKind.OBJECT
+    return _FieldKind.ANY
+
+
+class _FieldPlan(ty.NamedTuple):
+    name: str
+    spec_field: ty.Optional[str]
+    formatter: ty.Optional[ty.Callable[[ty.Any], JSON]]
+    optional: bool
+    kind: _FieldKind
+
+
+class _ObjectPlan(ty.NamedTuple):
+    fields: ty.Tuple[_FieldPlan, ...]
+    # if set, the serialized output is cached on the object instance
+    immutable: bool
+
+
+# compiled serialization plans, keyed by dataclass type
+_plans: ty.Dict[type, _ObjectPlan] = {}
+
+# instance attribute holding the cached output of immutable objects
+_FRAGMENT_ATTR = "_spec_fragment"
+
+
+def _compile_plan(cls: type) -> _ObjectPlan:
+    """
+    Compile and cache the serialization plan for the given dataclass type.
+    The plan contains everything that the serializer would otherwise need to reflect on
+    for every single emitted artifact.
+    """
+    fields = tuple(
+        _FieldPlan(
+            name=field.name,
+            spec_field=field.metadata.get("spec_field", None),
+            formatter=field.metadata.get("formatter", None),
+            optional=_is_optional(field.type),
+            kind=_field_kind(field.type),
+        )
+        for field in dc.fields(cls)
+    )
+    plan = _ObjectPlan(fields=fields, immutable=getattr(cls, "SPEC_IMMUTABLE", False))
+    # benign race: concurrent compiles of the same type produce equal plans
+    _plans[cls] = plan
+    return plan
+
+
+class _PlanCache(ty.Dict[type, _ObjectPlan]):
+    """
+    Serialization plans bound to a set of formatter overrides, eg. to format timestamps
+    with the timezone snapshot of an emitter rather than the current lib config.
+    """
+
+    def __init__(self, formatters: ty.Dict[ty.Any, ty.Callable[[ty.Any], JSON]]):
+        super().__init__()
+        self._formatters = formatters
+
+    def __missing__(self, cls: type) -> _ObjectPlan:
+        plan = _plans.get(cls) or _compile_plan(cls)
+        fields = tuple(f._replace(formatter=self._formatters.get(f.formatter, f.formatter)) for f in plan.fields)
+
+        bound = plan._replace(fields=fields)
+        self[cls] = bound
+        return bound
+
+
+def _spec_key(cls: type, name: str) -> str:
+    plan = _plans.get(cls) or _compile_plan(cls)
+    for field in plan.fields:
+        if field.name == name and field.spec_field is not None:
+            return field.spec_field
+
+    raise ValueError("field '{}' of {} has no spec_field".format(name, cls.__name__))
+
+
+def _visit_object(value: ty.Any, plans: _PlanCache) -> JSON:
+    cls = type(value)
+    plan = plans.get(cls)
+    if plan is None:
+        if not dc.is_dataclass(cls):
+            return _visit(value, plans)
+        plan = plans[cls]
+
+    if plan.immutable:
+        fragment = value.__dict__.get(_FRAGMENT_ATTR, None)
+        if fragment is not None:
+            return fragment
+
+    obj: ty.Dict[str, JSON] = {}
+    for name, spec_field, formatter, optional, kind in plan.fields:
+        val = getattr(value, name)
+
+        if val is None:
+            if not optional:
+                # TODO: fix exception text/type
+                raise RuntimeError("unacceptable none where not optional")
+
+            # for some reason, py3.7-3.10 fail to count the "continue" below as being covered
+            # by tests; this next line is a noop which avoids that behavior
+            val
+            continue
+
+        # spec_field takes precedence over spec_object
+        key = spec_field
+        if key is None:
+            key = getattr(val, "SPEC_OBJECT", None)
+            if key is None:
+                # TODO: fix error type
+                raise RuntimeError(
+                    "internal error, bad object decl: neither spec_field nor spec_object present for {}".format(name)
+                )
+
+        # if present, formatter takes precedence over serialization
+        if formatter is not None:
+            obj[key] = formatter(val)
+        elif kind is _FieldKind.PRIMITIVE and type(val) in _PRIMITIVE_TYPES:
+            obj[key] = val
+        elif kind is _FieldKind.OBJECT:
+            obj[key] = _visit_object(val, plans)
+        else:
+            obj[key] = _visit(val, plans)
+
+    if plan.immutable:
+        value.__dict__[_FRAGMENT_ATTR] = obj
+    return obj
+
+
+def _visit(value: ty.Any, plans: _PlanCache) -> JSON:
+    if type(value) in _PRIMITIVE_TYPES:
+        return value
+    elif dc.is_dataclass(value):
+        return _visit_object(value, plans)
+    elif isinstance(value, list) or isinstance(value, tuple):
+        return [_visit(k, plans) for k in value]
+    elif isinstance(value, dict):
+        return {k: _visit(v, plans) for k, v in value.items()}
+    elif isinstance(value, (str, float, int, bool, Enum)):
+        # subclasses of the primitives, which the encoder knows how to handle
+        return ty.cast(JSON, value)
+
+    raise RuntimeError("dont know how to serialize {}", value)
+
+
+class ArtifactTemplate:
+    """
+    A pre-serialized root artifact, for artifacts that only differ in a few field values
+    between emits. The template text is made once, and only the slots get filled in for each emit.
+    Should only be made through ``ArtifactEmitter.make_template``.
+    """
+
+    def __init__(self, format: str):
+        self._format = format
+
+    def render(self, *values: str) -> str:
+        """
+        Render the artifact JSON from the given slot values, which must already be JSON encoded.
+        The first two slots are always the root sequence number and timestamp.
+        """
+        return self._format.format(*values)
+
+
 class ArtifactEmitter:
     """
     Serializes and emits the data on the configured output channel for the lib.
     Uses the low level dataclass models for the spec, but should not be used in user code.
     """
 
-    def __init__(self, writer: Writer):
+    def __init__(
+        self,
+        writer: Writer,
+        encoder: ty.Optional[Encoder] = None,
+        timezone: ty.Union[tzinfo, None] = _NOT_SET,
+        deferred_checks: bool = False,
+    ):
         self._seq_lock = threading.Lock()
         self._seq = 0
 
         self._writer = writer
+        self._encoder = encoder or JsonEncoder()
+
+        # timezone is a snapshot for the lifetime of the emitter; if not given, use the current config
+        if timezone is _NOT_SET:
+            timezone = get_config().timezone
+        self._format_timestamp = get_timestamp_formatter(timezone).format
+        self._plans = _PlanCache({format_timestamp_with_tzinfo: self._format_timestamp})
+
+        # writers overriding the optional bytes path get the encoder output directly
+        self._write_bytes = getattr(type(writer), "write_bytes", Writer.write_bytes) is not Writer.write_bytes
 
         # use this event to ensure that the schema version message is the first to be
         # emitted, even when the initial writer was preempted
         self._version_emitted = threading.Event()
 
-    @staticmethod
-    def _serialize(artifact: ArtifactType):
-        def visit(
-            value: ty.Union[ArtifactType, ty.Dict, ty.List, Primitive],
-            formatter: ty.Optional[ty.Callable[[ty.Any], str]] = None,
-        ) -> JSON:
-            # if present, formatter takes precedence over serialization
-            if formatter is not None:
-                return formatter(value)
-
-            if dc.is_dataclass(value):
-                obj: ty.Dict[str, JSON] = {}
-                for field in dc.fields(value):
-                    val = getattr(value, field.name)
-
-                    if val is None:
-                        if not _is_optional(field.type):
-                            # TODO: fix exception text/type
-                            raise RuntimeError("unacceptable none where not optional")
-
-                        # for some reason, py3.7-3.10 fail to count the "continue" below as being covered
-                        # by tests; this next line is a noop which avoids that behavior
-                        val
-                        continue
-
-                    # spec_field takes precedence over spec_object
-                    spec_field: ty.Optional[str] = field.metadata.get("spec_field", None)
-                    spec_object: ty.Optional[str] = getattr(val, "SPEC_OBJECT", None)
-
-                    if spec_field is None and spec_object is None:
-                        # TODO: fix error type
-                        raise RuntimeError(
-                            "internal error, bad object decl: neither spec_field nor spec_object present for {}".format(
-                                field.name
-                            )
-                        )
-
-                    # safety: at least one is not None
-                    name: str = ty.cast(str, spec_field or spec_object)
-                    formatter = field.metadata.get("formatter", None)
-                    obj[name] = visit(val, formatter)
-                return obj
-            elif isinstance(value, list) or isinstance(value, tuple):
-                return [visit(k) for k in value]
-            elif isinstance(value, dict):
-                return {k: visit(v) for k, v in value.items()}
-            elif isinstance(value, (str, float, int, bool, Enum)):
-                return value
-
-            raise RuntimeError("dont know how to serialize {}", value)
-
-        return json.dumps(visit(artifact))
+        self._checker: ty.Optional[DeferredChecker] = None
+        if deferred_checks:
+            self._checker = DeferredChecker(self._report_check_error)
+
+    def _serialize(self, artifact: ArtifactType) -> str:
+        return self._encoder.encode(_visit(artifact, self._plans))
+
+    def _write(self, root: Root):
+        if self._write_bytes:
+            self._writer.write_bytes(self._encoder.encode_bytes(_visit(root, self._plans)))
+        else:
+            self._writer.write(self._serialize(root))
+
+    def _write_line(self, line: str):
+        if self._write_bytes:
+            self._writer.write_bytes(line.encode("utf-8"))
+        else:
+            self._writer.write(line)
 
     def emit(self, artifact: RootArtifactType):
         """
         Emit the given artifact after serialization to JSON.
         This method is threadsafe.
         """
+        seq = self._reserve_seq_no()
+        root = Root(
+            impl=artifact,
+            sequence_number=seq,
+            timestamp=time.time(),
+        )
+        self._write(root)
+
+        if self._checker is not None:
+            self._checker.submit(root)
+
+    def finish_checks(self):
+        """
+        Wait for the deferred runtime checks of the artifacts emitted so far, if enabled,
+        and stop checking any new ones. Failures are emitted as test run errors before returning.
+        """
+        checker, self._checker = self._checker, None
+        if checker is not None:
+            checker.close()
+
+    def _report_check_error(self, e: TypeCheckError):
+        error = Error(symptom="ocptv-runtime-type-check", message=str(e), software_infos=[], source_location=None)
+        self.emit(RunArtifact(impl=error))
+
+    def make_template(
+        self,
+        artifact: ty.Union[RunArtifact, StepArtifact],
+        slots: ty.Sequence[str],
+    ) -> ArtifactTemplate:
+        """
+        Make a template for emitting variations of the given artifact. The variations may only differ
+        in the values of the ``slots`` fields (by dataclass field name) of the ``artifact.impl`` object.
+        These fields must be primitives with a ``spec_field`` declaration.
+        """
+        impl = artifact.impl
+        root = ty.cast(ty.Dict[str, ty.Any], _visit(Root(impl=artifact, sequence_number=0, timestamp=0.0), self._plans))
+        impl_obj = root[artifact.SPEC_OBJECT][impl.SPEC_OBJECT]
+
+        markers: ty.List[str] = []
+
+        def mark(obj: ty.Dict[str, JSON], cls: type, name: str):
+            marker = "@@ocptv-slot-{}@@".format(len(markers))
+            obj[_spec_key(cls, name)] = marker
+            markers.append(marker)
+
+        mark(root, Root, "sequence_number")
+        mark(root, Root, "timestamp")
+        for name in slots:
+            mark(impl_obj, type(impl), name)
+
+        format = self._encoder.encode(root).replace("{", "{{").replace("}", "}}")
+        for i, marker in enumerate(markers):
+            encoded = self._encoder.encode(marker)
+            if format.count(encoded) != 1:
+                # TODO: fix error type
+                raise RuntimeError("internal error, cannot find template slot for {}".format(slots))
+            format = format.replace(encoded, "{%d}" % i)
+        return ArtifactTemplate(format)
+
+    def encode_value(self, value: Primitive) -> str:
+        """
+        Encode a primitive value to JSON, to be used in template slots.
+        """
+        t = type(value)
+        if t is int:
+            return int.__repr__(ty.cast(int, value))
+        if t is float and math.isfinite(ty.cast(float, value)):
+            return float.__repr__(ty.cast(float, value))
+        return self._encoder.encode(value)
+
+    def encode_timestamp(self, ts: float) -> str:
+        """
+        Format and encode a timestamp value, to be used in template slots.
+        """
+        # the formatted timestamp never contains characters that need escaping
+        return '"' + self._format_timestamp(ts) + '"'
+
+    def emit_template(self, template: ArtifactTemplate, *values: str):
+        """
+        Emit a variation of a templated artifact, given the JSON encoded values for its slots.
+        The root sequence number and timestamp slots are filled in here.
+        This method is threadsafe.
+        """
+        seq = self._reserve_seq_no()
+        self._write_line(template.render(int.__repr__(seq), self.encode_timestamp(time.time()), *values))
+
+    def _reserve_seq_no(self) -> int:
         seq = self._next_seq_no()
         if seq == 0:
             self._emit_version()
@@ -105,13 +365,7 @@ class ArtifactEmitter:
 
         # wait to make sure that version schema was written first
         self._version_emitted.wait()
-
-        root = Root(
-            impl=artifact,
-            sequence_number=seq,
-            timestamp=time.time(),
-        )
-        self._writer.write(self._serialize(root))
+        return seq
 
     def _emit_version(self):
         # use defaults for schema version here, should be set to latest
@@ -121,7 +375,23 @@ class ArtifactEmitter:
             sequence_number=0,
             timestamp=time.time(),
         )
-        self._writer.write(self._serialize(root))
+        self._write(root)
+
+        if self._checker is not None:
+            self._checker.submit(root)
+
+    def finish_checks(self):
+        """
+        Wait for the deferred runtime checks of the artifacts emitted so far, if enabled,
+        and stop checking any new ones. Failures are emitted as test run errors before returning.
+        """
+        checker, self._checker = self._checker, None
+        if checker is not None:
+            checker.close()
+
+    def _report_check_error(self, e: TypeCheckError):
+        error = Error(symptom="ocptv-runtime-type-check", message=str(e), software_infos=[], source_location=None)
+        self.emit(RunArtifact(impl=error))
 
         # awake all threads that may have been waiting on version first write
         self._version_emitted.set()
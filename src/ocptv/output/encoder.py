@@ -0,0 +1,104 @@
+"""
+This module contains the JSON encoder backends used by the OCPTV library output.
+"""
+
+import importlib
+import json
+import typing as ty
+from abc import ABC, abstractmethod
+
+from ocptv.api import export_api
+
+Primitive = ty.Union[float, int, bool, str, None]
+JSON = ty.Union[ty.Dict[str, "JSON"], ty.List["JSON"], Primitive]
+
+
+class Encoder(ABC):  # pragma: no cover
+    """
+    Abstract encoder interface for the lib. Should be used as a base for
+    any JSON encoder implementation (for typing purposes).
+    NOTE: Encoder impls must ensure thread safety.
+    """
+
+    @abstractmethod
+    def encode(self, obj: JSON) -> str:
+        pass
+
+    def encode_bytes(self, obj: JSON) -> bytes:
+        """
+        Encode the given object to utf-8 JSON bytes. Encoders that natively produce
+        bytes should override this to avoid the intermediary string.
+        """
+        return self.encode(obj).encode("utf-8")
+
+
+@export_api
+class JsonEncoder(Encoder):
+    """
+    Encoder using the python stdlib ``json`` module. This is the library default.
+    """
+
+    def __init__(self, *, compact: bool = False):
+        """
+        :param compact: if True, the output does not contain any whitespace between
+            the JSON tokens, which produces smaller output.
+        """
+        separators = (",", ":") if compact else (", ", ": ")
+        self._encoder = json.JSONEncoder(separators=separators)
+
+    def encode(self, obj: JSON) -> str:
+        return self._encoder.encode(obj)
+
+
+@export_api
+class FastJsonEncoder(Encoder):
+    """
+    Encoder using a faster third party JSON backend, if one is importable.
+    Currently tries ``orjson`` then ``ujson``, falling back to the compact stdlib encoder
+    if neither is available.
+
+    All of the backends produce compact output.
+    """
+
+    def __init__(self):
+        self._dumps_str: ty.Callable[[JSON], str]
+        self._dumps_bytes: ty.Callable[[JSON], bytes]
+
+        orjson = _try_import("orjson")
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+
+            self._backend = "orjson"
+            self._dumps_bytes = lambda obj: orjson.dumps(obj, option=option)
+            self._dumps_str = lambda obj: self._dumps_bytes(obj).decode("utf-8")
+            return
+
+        ujson = _try_import("ujson")
+        if ujson is not None:
+            self._backend = "ujson"
+            self._dumps_str = lambda obj: ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+            self._dumps_bytes = lambda obj: self._dumps_str(obj).encode("utf-8")
+            return
+
+        fallback = JsonEncoder(compact=True)
+        self._backend = "json"
+        self._dumps_str = fallback.encode
+        self._dumps_bytes = fallback.encode_bytes
+
+    @property
+    def backend(self) -> str:
+        """Name of the backend module in use."""
+        return self._backend
+
+    def encode(self, obj: JSON) -> str:
+        return self._dumps_str(obj)
+
+    def encode_bytes(self, obj: JSON) -> bytes:
+        return self._dumps_bytes(obj)
+
+
+def _try_import(name: str) -> ty.Any:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
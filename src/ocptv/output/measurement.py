@@ -6,7 +6,7 @@ from contextlib import contextmanager
 from ocptv.api import export_api
 
 from .dut import HardwareInfo, Subcomponent
-from .emit import ArtifactEmitter
+from .emit import ArtifactEmitter, ArtifactTemplate
 from .objects import (
     MeasurementSeriesElement,
     MeasurementSeriesEnd,
@@ -19,6 +19,9 @@ from .objects import (
 from .objects import Validator as ValidatorSpec
 from .objects import ValidatorType, ValidatorValueType
 
+# value types that are known to pass the runtime checks for series elements
+_TEMPLATE_VALUE_TYPES = frozenset([float, int, bool, str])
+
 
 class MeasurementSeriesEmitter(ArtifactEmitter):
     def __init__(self, step_id: str, emitter: ArtifactEmitter):
@@ -28,6 +31,28 @@ class MeasurementSeriesEmitter(ArtifactEmitter):
     def emit_impl(self, impl: MeasurementSeriesType):
         self._emitter.emit(StepArtifact(id=self._step_id, impl=impl))
 
+    def make_element_template(self, series_id: str) -> ArtifactTemplate:
+        # field values here only need to pass the type checks, they are replaced by the slots
+        element = MeasurementSeriesElement(
+            index=0,
+            value=0,
+            timestamp=0.0,
+            series_id=series_id,
+            metadata=None,
+        )
+        return self._emitter.make_template(
+            StepArtifact(id=self._step_id, impl=element),
+            slots=("index", "value", "timestamp"),
+        )
+
+    def emit_element(self, template: ArtifactTemplate, index: int, value: MeasurementValueType, timestamp: float):
+        self._emitter.emit_template(
+            template,
+            int.__repr__(index),
+            self._emitter.encode_value(value),
+            self._emitter.encode_timestamp(timestamp),
+        )
+
 
 # Following object is a proxy type so we get future flexibility, avoiding the usage
 # of the low-level models.
@@ -113,6 +138,10 @@ class MeasurementSeries:
 
         self._start(name, unit, validators, hardware_info, subcomponent, metadata)
 
+        # elements without metadata only differ in a few values, so they can be emitted
+        # from a pre-serialized template rather than going through the spec objects
+        self._element_template = emitter.make_element_template(series_id)
+
     def add_measurement(
         self,
         *,
@@ -137,6 +166,11 @@ class MeasurementSeries:
             index = self._index
             self._index += 1
 
+        if metadata is None and type(value) in _TEMPLATE_VALUE_TYPES and type(timestamp) is float:
+            # fast path; other value types go through the spec objects for the runtime checks
+            self._emitter.emit_element(self._element_template, index, value, timestamp)
+            return
+
         measurement = MeasurementSeriesElement(
             index=index,
             value=value,
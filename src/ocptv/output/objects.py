@@ -10,6 +10,10 @@ If ``SPEC_OBJECT`` is set, this field is an union type and serialization should
 value in ``SPEC_OBJECT`` as the serialized field name. Otherwise, the ``metadata.spec_field``
 says what the serializer should use for field name.
 In general, ``metadata.spec_field`` should only be present for primitive types.
+
+Objects that set ``SPEC_IMMUTABLE = True`` are considered frozen once made. They are typically
+made once, during DUT discovery, then referenced by many artifacts. The serializer caches their
+JSON output on first use and reuses it, so they must not be changed afterwards.
 """
 
 import dataclasses as dc
@@ -17,7 +21,7 @@ import typing as ty
 from enum import Enum
 
 from ocptv.api import export_api
-from ocptv.formatter import format_enum, format_timestamp
+from ocptv.formatter import format_enum, get_timestamp_formatter
 
 if ty.TYPE_CHECKING:  # pragma: no cover
     # mypy extension for py37
@@ -30,8 +34,11 @@ from .runtime_checks import check_field_types
 
 
 def format_timestamp_with_tzinfo(ts: float) -> str:
-    """Curry form with timezone from config"""
-    return format_timestamp(ts, tz=get_config().timezone)
+    """
+    Curry form with timezone from config.
+    Note: the emitter substitutes this with a formatter for its own timezone snapshot.
+    """
+    return get_timestamp_formatter(get_config().timezone).format(ts)
 
 
 class ArtifactType(Protocol):
@@ -108,6 +115,7 @@ class SourceLocation:
     """
 
     SPEC_OBJECT: ty.ClassVar[str] = "sourceLocation"
+    SPEC_IMMUTABLE: ty.ClassVar[bool] = True
 
     file: str = dc.field(
         metadata={"spec_field": "file"},
@@ -234,6 +242,7 @@ class Subcomponent:
     """
 
     SPEC_OBJECT: ty.ClassVar[str] = "subcomponent"
+    SPEC_IMMUTABLE: ty.ClassVar[bool] = True
 
     type: ty.Optional[SubcomponentType] = dc.field(
         metadata={
@@ -324,6 +333,7 @@ class SoftwareInfo:
     """
 
     SPEC_OBJECT: ty.ClassVar[str] = "softwareInfo"
+    SPEC_IMMUTABLE: ty.ClassVar[bool] = True
 
     id: str = dc.field(
         metadata={"spec_field": "softwareInfoId"},
@@ -368,6 +378,7 @@ class HardwareInfo:
     """
 
     SPEC_OBJECT: ty.ClassVar[str] = "hardwareInfo"
+    SPEC_IMMUTABLE: ty.ClassVar[bool] = True
 
     id: str = dc.field(
         metadata={"spec_field": "hardwareInfoId"},
@@ -590,6 +601,7 @@ class Validator:
     """
 
     SPEC_OBJECT: ty.ClassVar[str] = "validator"
+    SPEC_IMMUTABLE: ty.ClassVar[bool] = True
 
     name: ty.Optional[str] = dc.field(
         metadata={"spec_field": "name"},
@@ -22,7 +22,7 @@ from .objects import (
     TestResult,
     TestStatus,
 )
-from .source import SourceLocation, get_caller_source
+from .source import ERROR_SEVERITIES, SourceLocation, resolve_source
 from .step import TestStep
 
 
@@ -104,7 +104,14 @@ class TestRun:
 
         # once a test run has started, all semantically descendant artifacts
         # must use the same emitter without interruption
-        self._emitter = ArtifactEmitter(writer=get_config().writer)
+        config = get_config()
+        self._emitter = ArtifactEmitter(
+            writer=config.writer,
+            encoder=config.encoder,
+            timezone=config.timezone,
+            deferred_checks=config.enable_runtime_checks and config.runtime_checks.deferred,
+        )
+        self._source_policy = config.source_location
 
         self._step_lock = threading.Lock()
         self._step_id: int = 0
@@ -138,6 +145,9 @@ class TestRun:
         For additional details on parameters, see:
         - https://github.com/opencomputeproject/ocp-diag-core/tree/main/json_spec#testrunend
         """
+        # any deferred type check failures must be output before the run end
+        self._emitter.finish_checks()
+
         end = RunEnd(
             status=status,
             result=result,
@@ -192,7 +202,7 @@ class TestRun:
             step_id = self._step_id
             self._step_id += 1
 
-        step = TestStep(name, step_id=step_id, emitter=self._emitter)
+        step = TestStep(name, step_id=step_id, emitter=self._emitter, source_policy=self._source_policy)
         return step
 
     def add_log(
@@ -215,13 +225,10 @@ class TestRun:
         - https://github.com/opencomputeproject/ocp-diag-core/tree/main/json_spec#log
         """
 
-        if source_location is SourceLocation.CALLER:
-            source_location = get_caller_source()
-
         log = Log(
             severity=severity,
             message=message,
-            source_location=source_location.to_spec() if source_location else None,
+            source_location=resolve_source(source_location, self._source_policy, is_error=severity in ERROR_SEVERITIES),
         )
         self._emitter.emit(RunArtifact(impl=log))
 
@@ -252,14 +259,11 @@ class TestRun:
         if software_infos is None:
             software_infos = []
 
-        if source_location is SourceLocation.CALLER:
-            source_location = get_caller_source()
-
         error = Error(
             symptom=symptom,
             message=message,
             software_infos=[o.to_spec() for o in software_infos],
-            source_location=source_location.to_spec() if source_location else None,
+            source_location=resolve_source(source_location, self._source_policy, is_error=True),
         )
         self._emitter.emit(RunArtifact(impl=error))
 
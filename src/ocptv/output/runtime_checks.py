@@ -1,5 +1,7 @@
 import dataclasses as dc
+import queue
 import sys
+import threading
 import typing as ty
 
 if ty.TYPE_CHECKING:  # pragma: no cover
@@ -192,6 +194,144 @@ def _check_type_any(obj: CheckedValue, hint: ty.Type, trace: ty.List[str]):
         raise TypeCheckError(obj, expected=hint.__name__, trace=trace)
 
 
+# Compiled checks. The ``_check_type_any`` function above walks the type hints on every call and
+# keeps track of the path to the current field, which is only needed for the error message.
+# Instead, a predicate is compiled once for each type hint and it only answers whether the value
+# matches. On failure, ``_check_type_any`` is used to produce the detailed error.
+# The predicates must accept exactly the same values as ``_check_type_any``.
+_Predicate = ty.Callable[[ty.Any], bool]
+
+# compiled predicates, by type hint and by dataclass type
+_checkers: ty.Dict[ty.Any, _Predicate] = {}
+_dataclass_checkers: ty.Dict[type, _Predicate] = {}
+
+# instance attribute marking objects that passed the checks in `check_field_types`, such that
+# they are not checked again when nested into other objects. Spec objects are not modified
+# after construction, so the result still holds.
+_CHECKED_ATTR = "_spec_checked"
+
+
+def _accept(obj: ty.Any) -> bool:
+    return True
+
+
+def _reject(obj: ty.Any) -> bool:
+    return False
+
+
+def _get_checker(hint: ty.Any) -> _Predicate:
+    checker = _checkers.get(hint, None)
+    if checker is None:
+        checker = _checkers[hint] = _compile_hint(hint)
+    return checker
+
+
+def _compile_hint(hint: ty.Any) -> _Predicate:
+    type_origin = get_origin(hint)
+    type_args = get_args(hint)
+
+    if type_origin is list:
+        if len(type_args) != 1:
+            return _accept
+
+        check_item = _get_checker(type_args[0])
+
+        def check_list(obj: ty.Any) -> bool:
+            if not isinstance(obj, list):
+                return False
+            for v in obj:
+                if not check_item(v):
+                    return False
+            return True
+
+        return check_list
+
+    elif type_origin is dict:
+        if len(type_args) != 2:
+            return _accept
+
+        check_key = _get_checker(type_args[0])
+        check_value = _get_checker(type_args[1])
+
+        def check_dict(obj: ty.Any) -> bool:
+            if not isinstance(obj, dict):
+                return False
+            for k, v in obj.items():
+                if not check_key(k) or not check_value(v):
+                    return False
+            return True
+
+        return check_dict
+
+    elif type_origin is ty.Union:
+        if ty.Any in type_args:
+            return _accept
+
+        # the non-generic arms all resolve to the same dataclass check or to an isinstance
+        # check, so they can be done in a single step
+        plain = tuple(x for x in type_args if get_origin(x) is None)
+        generics = [_get_checker(x) for x in type_args if get_origin(x) is not None]
+        if plain:
+            generics.insert(0, _compile_instance(plain))
+
+        if len(generics) == 1:
+            return generics[0]
+
+        def check_union(obj: ty.Any) -> bool:
+            for check in generics:
+                if check(obj):
+                    return True
+            return False
+
+        return check_union
+
+    elif type_origin is not None:
+        # unsupported, let the slow path raise the error
+        return _reject
+
+    elif hint is ty.Any:
+        return _accept
+
+    return _compile_instance((hint,))
+
+
+def _compile_instance(hints: ty.Tuple[ty.Any, ...]) -> _Predicate:
+    def check_instance(obj: ty.Any) -> bool:
+        # same as dc.is_dataclass for instances; note that dataclass values are checked
+        # against their own field types, regardless of the expected type
+        if hasattr(type(obj), "__dataclass_fields__"):
+            return _check_dataclass(obj)
+        return isinstance(obj, hints)
+
+    return check_instance
+
+
+def _check_dataclass(obj: ty.Any) -> bool:
+    if _CHECKED_ATTR in obj.__dict__:
+        return True
+
+    return _get_dataclass_checker(type(obj))(obj)
+
+
+def _get_dataclass_checker(cls: type) -> _Predicate:
+    checker = _dataclass_checkers.get(cls, None)
+    if checker is None:
+        checker = _dataclass_checkers[cls] = _compile_dataclass(cls)
+    return checker
+
+
+def _compile_dataclass(cls: type) -> _Predicate:
+    fields = tuple((field.name, _get_checker(field.type)) for field in dc.fields(cls))
+
+    def check_fields(obj: ty.Any) -> bool:
+        for name, check in fields:
+            if not check(getattr(obj, name)):
+                return False
+        return True
+
+    return check_fields
+
+
 def check_field_types(obj: Dataclass):
     """
     Check that the values inside the given dataclass' fields are of the correct
@@ -199,11 +339,62 @@ def check_field_types(obj: Dataclass):
     This currently covers needed field types used in this lib, but is not generic
     enough to cover all typing configurations. See tests for more details.
 
-    Can be disabled in lib config. See `ocptv.output.config()`.
+    Nested dataclass instances that already passed this check are not checked again.
+
+    Can be disabled or sampled in lib config. See `ocptv.output.config()`.
 
     :throws TypeError on failures.
     """
-    if not get_config().enable_runtime_checks:
+    config = get_config()
+    if not config.enable_runtime_checks or not config.runtime_checks.check(type(obj)):
         return
 
-    _check_type_any(obj, type(obj), trace=[])
+    _check_object(obj)
+
+
+def _check_object(obj: Dataclass):
+    cls = type(obj)
+    if not _get_dataclass_checker(cls)(obj):
+        # slow path, walks the fields again to produce the error details
+        _check_type_any(obj, cls, trace=[])
+
+    obj.__dict__[_CHECKED_ATTR] = True
+
+
+class DeferredChecker:
+    """
+    Runs the type checks for the submitted objects on a background thread and reports
+    the failures through the given callback, on the same thread.
+    Objects are skipped if the queue of pending checks is full.
+    """
+
+    def __init__(self, report: ty.Callable[[TypeCheckError], None], *, maxsize: int = 4096):
+        self._report = report
+        self._queue: "queue.Queue[ty.Optional[Dataclass]]" = queue.Queue(maxsize)
+
+        self._thread = threading.Thread(target=self._run, name="ocptv-runtime-checks", daemon=True)
+        self._thread.start()
+
+    def submit(self, obj: Dataclass):
+        try:
+            self._queue.put_nowait(obj)
+        except queue.Full:
+            pass
+
+    def close(self):
+        """
+        Wait for the pending checks to finish and stop the background thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            obj = self._queue.get()
+            if obj is None:
+                return
+
+            try:
+                _check_object(obj)
+            except TypeCheckError as e:
+                self._report(e)
@@ -1,8 +1,11 @@
-import traceback
+import sys
 import typing as ty
+from types import CodeType
 
 from ocptv.api import export_api
 
+from .config import SourceLocationPolicy
+from .objects import LogSeverity
 from .objects import SourceLocation as SourceLocationSpec
 
 
@@ -40,8 +43,7 @@ class SourceLocation:
         :param filename: diagnostic package source filename being referenced.
         :param line_number: line number inside the diagnostic package source file.
         """
-        self._file = filename
-        self._line = line_number
+        self._spec_object = SourceLocationSpec(file=filename, line=line_number)
 
     def to_spec(self) -> ty.Optional[SourceLocationSpec]:
         """
@@ -49,7 +51,7 @@ class SourceLocation:
 
         :meta private:
         """
-        return SourceLocationSpec(file=self._file, line=self._line)
+        return self._spec_object
 
 
 # note: the field values here dont matter. This is used as a guard value.
@@ -70,6 +72,18 @@ class NullSourceLocation(SourceLocation):
         return None
 
 
+# log severities considered errors by the ``ERRORS_ONLY`` policy
+ERROR_SEVERITIES = frozenset([LogSeverity.ERROR, LogSeverity.FATAL])
+
+
+# interned caller locations, keyed by code object and line number, such that repeated
+# calls from the same line in user code reuse the same instance (and its serialized output)
+_callsites: ty.Dict[ty.Tuple[CodeType, int], SourceLocation] = {}
+
+# bound on the number of interned locations; the cache is reset when reached
+_MAX_CALLSITES = 4096
+
+
 def get_caller_source(offset: int = 1) -> SourceLocation:
     """
     Get the caller site coordinates as a SourceLocation instance.
@@ -85,21 +99,44 @@ def get_caller_source(offset: int = 1) -> SourceLocation:
     """
     assert offset > 0
 
-    # TODO: this may be refactored later on to look at frame data, rather than use an index
-    frames = traceback.extract_stack()[::-1]
-    try:
-        # the +1 is this function frame
-        caller = frames[offset + 1]
-
-        lineno = 0
-        if caller.lineno is not None:
-            lineno = caller.lineno
-
-        return SourceLocation(
-            filename=caller.filename,
-            line_number=lineno,
-        )
-    except IndexError:
-        # unlikely: error trying to get the user code frame, so return an
-        # instance that will translate to None in the spec
-        return NullSourceLocation()
+    # only walk the frames up to the needed depth; the +1 is this function frame
+    frame = sys._getframe()
+    for _ in range(offset + 1):
+        frame = frame.f_back  # type: ignore[assignment]
+        if frame is None:
+            # unlikely: error trying to get the user code frame, so return an
+            # instance that will translate to None in the spec
+            return NullSourceLocation()
+
+    lineno = frame.f_lineno or 0
+    key = (frame.f_code, lineno)
+
+    location = _callsites.get(key, None)
+    if location is None:
+        if len(_callsites) >= _MAX_CALLSITES:
+            _callsites.clear()
+
+        location = SourceLocation(filename=frame.f_code.co_filename, line_number=lineno)
+        _callsites[key] = location
+    return location
+
+
+def resolve_source(
+    source_location: ty.Optional[SourceLocation],
+    policy: SourceLocationPolicy,
+    *,
+    is_error: bool,
+) -> ty.Optional[SourceLocationSpec]:
+    """
+    Internal usage. Convert the ``source_location`` parameter of the public api methods to
+    the low-level model, capturing the caller source location if requested and allowed by policy.
+    Must be called directly from the public api method, as the caller frame offset depends on it.
+    """
+    if source_location is SourceLocation.CALLER:
+        if not policy.capture(is_error):
+            return None
+
+        # skip this function and the lib function calling it
+        source_location = get_caller_source(offset=2)
+
+    return source_location.to_spec() if source_location else None
@@ -8,6 +8,7 @@ from contextlib import contextmanager
 
 from ocptv.api import export_api
 
+from .config import SourceLocationPolicy
 from .dut import HardwareInfo, SoftwareInfo, Subcomponent
 from .emit import ArtifactEmitter
 from .measurement import MeasurementSeries, MeasurementSeriesEmitter, Validator
@@ -28,7 +29,7 @@ from .objects import (
     StepStart,
     TestStatus,
 )
-from .source import SourceLocation, get_caller_source
+from .source import ERROR_SEVERITIES, SourceLocation, resolve_source
 
 
 @export_api
@@ -71,11 +72,19 @@ class TestStep:
     - https://github.com/opencomputeproject/ocp-diag-core/tree/main/json_spec#test-step-artifacts
     """
 
-    def __init__(self, name: str, *, step_id: int, emitter: ArtifactEmitter):
+    def __init__(
+        self,
+        name: str,
+        *,
+        step_id: int,
+        emitter: ArtifactEmitter,
+        source_policy: SourceLocationPolicy = SourceLocationPolicy.ALWAYS,
+    ):
         self._name = name
         self._id = step_id
         self._idstr = "{}".format(step_id)
         self._emitter = emitter
+        self._source_policy = source_policy
 
         # TODO: do we want manually controlled values for the series id?
         self._series_lock = threading.Lock()
@@ -251,16 +260,13 @@ class TestStep:
         For additional details on parameters, see:
         - https://github.com/opencomputeproject/ocp-diag-core/tree/main/json_spec#diagnosis
         """
-        if source_location is SourceLocation.CALLER:
-            source_location = get_caller_source()
-
         diag = Diagnosis(
             verdict=verdict,
             type=diagnosis_type,
             message=message,
             hardware_info=hardware_info.to_spec() if hardware_info else None,
             subcomponent=subcomponent.to_spec() if subcomponent else None,
-            source_location=source_location.to_spec() if source_location else None,
+            source_location=resolve_source(source_location, self._source_policy, is_error=True),
         )
         self._emitter.emit(StepArtifact(id=self._idstr, impl=diag))
 
@@ -284,13 +290,10 @@ class TestStep:
         - https://github.com/opencomputeproject/ocp-diag-core/tree/main/json_spec#log
         """
 
-        if source_location is SourceLocation.CALLER:
-            source_location = get_caller_source()
-
         log = Log(
             severity=severity,
             message=message,
-            source_location=source_location.to_spec() if source_location else None,
+            source_location=resolve_source(source_location, self._source_policy, is_error=severity in ERROR_SEVERITIES),
         )
         self._emitter.emit(StepArtifact(id=self._idstr, impl=log))
 
@@ -321,14 +324,11 @@ class TestStep:
         if software_infos is None:
             software_infos = []
 
-        if source_location is SourceLocation.CALLER:
-            source_location = get_caller_source()
-
         error = Error(
             symptom=symptom,
             message=message,
             software_infos=[o.to_spec() for o in software_infos],
-            source_location=source_location.to_spec() if source_location else None,
+            source_location=resolve_source(source_location, self._source_policy, is_error=True),
         )
         self._emitter.emit(StepArtifact(id=self._idstr, impl=error))
 
@@ -54,3 +54,16 @@ def offset_timezone(utc_offset_hours: float):
         yield
     finally:
         tv.config(timezone=prev)
+
+
+@contextmanager
+def source_location_policy(policy: tv.SourceLocationPolicy):
+    from ocptv.output.config import get_config
+
+    try:
+        prev = get_config().source_location
+        tv.config(source_location=policy)
+
+        yield
+    finally:
+        tv.config(source_location=prev)
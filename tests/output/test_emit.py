@@ -1,12 +1,22 @@
 import dataclasses as dc
+import time
 import typing as ty
+from enum import Enum
 
 import pytest
 
-from ocptv.output import StdoutWriter
-from ocptv.output.emit import ArtifactEmitter
+from ocptv.output import JsonEncoder, StdoutWriter
+from ocptv.output.emit import JSON, ArtifactEmitter
+from ocptv.output.objects import (
+    MeasurementSeriesElement,
+    MeasurementValueType,
+    Root,
+    StepArtifact,
+    StepStart,
+    format_timestamp_with_tzinfo,
+)
 
-from .conftest import MockWriter, disable_runtime_checks
+from .conftest import MockWriter, disable_runtime_checks, offset_timezone
 
 
 def test_stdout_writer(capsys: pytest.CaptureFixture):
@@ -77,3 +87,118 @@ def test_emil_fails_unserializable_type(writer: MockWriter):
         e = ArtifactEmitter(writer)
         with pytest.raises(RuntimeError):
             e.emit(Unserializable())  # type: ignore[arg-type]
+
+
+def test_emit_enum_without_formatter(writer: MockWriter):
+    class TestEnum(str, Enum):
+        VALUE = "value"
+
+    @dc.dataclass
+    class TestObject:
+        SPEC_OBJECT: ty.ClassVar[str] = "test"
+        field: TestEnum = dc.field(metadata={"spec_field": "field"})
+
+    e = ArtifactEmitter(writer)
+    e.emit(TestObject(field=TestEnum.VALUE))  # type: ignore[arg-type]
+
+    assert writer.decoded_obj(1)["test"] == {"field": "value"}
+
+
+def test_emit_fails_non_dataclass_in_object_field(writer: MockWriter):
+    """
+    Try to emit an artifact with a field declared as a dataclass but that contains
+    a value which cannot be serialized.
+    Expect failure.
+    Type errors are ignored.
+    """
+
+    @dc.dataclass
+    class Inner:
+        SPEC_OBJECT: ty.ClassVar[str] = "inner"
+
+    @dc.dataclass
+    class TestObject:
+        SPEC_OBJECT: ty.ClassVar[str] = "test"
+        inner: Inner
+
+    class Unserializable:
+        SPEC_OBJECT: ty.ClassVar[str] = "inner"
+
+    with disable_runtime_checks():
+        e = ArtifactEmitter(writer)
+        with pytest.raises(RuntimeError):
+            e.emit(TestObject(inner=Unserializable()))  # type: ignore[arg-type]
+
+
+def test_emit_caches_immutable_objects(writer: MockWriter):
+    @dc.dataclass
+    class Inner:
+        SPEC_OBJECT: ty.ClassVar[str] = "inner"
+        SPEC_IMMUTABLE: ty.ClassVar[bool] = True
+        field: str = dc.field(metadata={"spec_field": "field"})
+
+    @dc.dataclass
+    class TestObject:
+        SPEC_OBJECT: ty.ClassVar[str] = "test"
+        inner: Inner
+
+    inner = Inner(field="value")
+    e = ArtifactEmitter(writer)
+    e.emit(TestObject(inner=inner))  # type: ignore[arg-type]
+
+    # immutable objects are not expected to change; the output must come from the cache
+    inner.field = "changed"
+    e.emit(TestObject(inner=inner))  # type: ignore[arg-type]
+
+    assert writer.decoded_obj(1)["test"] == {"inner": {"field": "value"}}
+    assert writer.decoded_obj(2)["test"] == {"inner": {"field": "value"}}
+
+
+@pytest.mark.parametrize("value", [1200, 1.5, True, "str", float("nan")])
+def test_template_matches_serialization(writer: MockWriter, value: MeasurementValueType):
+    ts = time.time()
+    e = ArtifactEmitter(writer)
+
+    element = MeasurementSeriesElement(index=0, value=0, timestamp=0.0, series_id="0_0", metadata=None)
+    template = e.make_template(StepArtifact(id="0", impl=element), slots=("index", "value", "timestamp"))
+
+    expected = Root(
+        impl=StepArtifact(
+            id="0",
+            impl=MeasurementSeriesElement(index=42, value=value, timestamp=ts, series_id="0_0", metadata=None),
+        ),
+        sequence_number=7,
+        timestamp=ts,
+    )
+    assert template.render(
+        "7",
+        e.encode_timestamp(ts),
+        "42",
+        e.encode_value(value),
+        e.encode_timestamp(ts),
+    ) == e._serialize(expected)
+
+
+def test_template_fails_unknown_slot(writer: MockWriter):
+    e = ArtifactEmitter(writer)
+
+    with pytest.raises(ValueError):
+        e.make_template(StepArtifact(id="0", impl=StepStart(name="step0")), slots=("unknown",))
+
+
+def test_template_fails_unmatched_slot(writer: MockWriter):
+    class QuotingEncoder(JsonEncoder):
+        def encode(self, obj: JSON) -> str:
+            if isinstance(obj, str):
+                return "'{}'".format(obj)
+            return super().encode(obj)
+
+    e = ArtifactEmitter(writer, encoder=QuotingEncoder())
+
+    with pytest.raises(RuntimeError):
+        e.make_template(StepArtifact(id="0", impl=StepStart(name="step0")), slots=("name",))
+
+
+def test_format_timestamp_with_tzinfo_uses_config():
+    with offset_timezone(utc_offset_hours=3):
+        assert format_timestamp_with_tzinfo(0).endswith("+03:00")
@@ -0,0 +1,121 @@
+import json
+import sys
+import types
+import typing as ty
+
+import pytest
+
+import ocptv.output as tv
+from ocptv.output import FastJsonEncoder, JsonEncoder, TestResult, TestStatus, Writer
+from ocptv.output.emit import JSON, ArtifactEmitter
+from ocptv.output.objects import RunArtifact, RunEnd, StepArtifact, StepStart
+
+from .conftest import MockWriter
+
+REF_OBJECT: JSON = {"key": [1, 2.5, True, None, "str"], "nested": {"a": "b"}}
+
+
+class MockBytesWriter(Writer):
+    def __init__(self):
+        self.buffers: ty.List[bytes] = []
+
+    def write(self, buffer: str):  # pragma: no cover
+        raise AssertionError("unexpected str output path")
+
+    def write_bytes(self, buffer: bytes):
+        self.buffers.append(buffer)
+
+
+@pytest.fixture
+def encoder():
+    yield
+    tv.config(encoder=JsonEncoder())
+
+
+def test_json_encoder():
+    assert JsonEncoder().encode(REF_OBJECT) == json.dumps(REF_OBJECT)
+    assert JsonEncoder(compact=True).encode(REF_OBJECT) == json.dumps(REF_OBJECT, separators=(",", ":"))
+    assert JsonEncoder().encode_bytes(REF_OBJECT) == json.dumps(REF_OBJECT).encode("utf-8")
+
+
+def test_fast_encoder_orjson(monkeypatch: pytest.MonkeyPatch):
+    def dumps(obj, option):
+        assert option == 42
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+    monkeypatch.setitem(sys.modules, "orjson", types.SimpleNamespace(dumps=dumps, OPT_NON_STR_KEYS=42))
+
+    e = FastJsonEncoder()
+    assert e.backend == "orjson"
+    assert e.encode_bytes(REF_OBJECT) == json.dumps(REF_OBJECT, separators=(",", ":")).encode("utf-8")
+    assert e.encode(REF_OBJECT) == json.dumps(REF_OBJECT, separators=(",", ":"))
+
+
+def test_fast_encoder_ujson(monkeypatch: pytest.MonkeyPatch):
+    def dumps(obj, ensure_ascii, escape_forward_slashes):
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=ensure_ascii)
+
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "ujson", types.SimpleNamespace(dumps=dumps))
+
+    e = FastJsonEncoder()
+    assert e.backend == "ujson"
+    assert e.encode(REF_OBJECT) == json.dumps(REF_OBJECT, separators=(",", ":"))
+    assert e.encode_bytes(REF_OBJECT) == json.dumps(REF_OBJECT, separators=(",", ":")).encode("utf-8")
+
+
+def test_fast_encoder_fallback(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    monkeypatch.setitem(sys.modules, "ujson", None)
+
+    e = FastJsonEncoder()
+    assert e.backend == "json"
+    assert e.encode(REF_OBJECT) == JsonEncoder(compact=True).encode(REF_OBJECT)
+    assert e.encode_bytes(REF_OBJECT) == JsonEncoder(compact=True).encode_bytes(REF_OBJECT)
+
+
+def test_config_encoder(writer: MockWriter, encoder):
+    tv.config(encoder=JsonEncoder(compact=True))
+
+    run = tv.TestRun(name="test", version="1.0")
+    run.start(dut=tv.Dut(id="test_dut"))
+
+    assert len(writer.lines) == 2
+    assert writer.lines[1].startswith('{"testRunArtifact":{"testRunStart":{"name":"test",')
+
+
+def test_emit_bytes_path():
+    w = MockBytesWriter()
+    e = ArtifactEmitter(w)
+    e.emit(RunArtifact(impl=RunEnd(status=TestStatus.COMPLETE, result=TestResult.PASS)))
+
+    assert len(w.buffers) == 2
+    assert json.loads(w.buffers[1])["testRunArtifact"] == {
+        "testRunEnd": {
+            "status": "COMPLETE",
+            "result": "PASS",
+        },
+    }
+
+
+def test_emit_template_bytes_path():
+    w = MockBytesWriter()
+    e = ArtifactEmitter(w)
+
+    template = e.make_template(StepArtifact(id="0", impl=StepStart(name="step0")), slots=("name",))
+    e.emit_template(template, e.encode_value("step1"))
+
+    assert len(w.buffers) == 2
+    assert json.loads(w.buffers[1])["testStepArtifact"] == {
+        "testStepStart": {
+            "name": "step1",
+        },
+        "testStepId": "0",
+    }
+
+
+def test_writer_default_bytes_path():
+    w = MockWriter()
+    w.write_bytes(b'{"key": "value"}')
+
+    assert w.lines == ['{"key": "value"}']
@@ -1,3 +1,4 @@
+import json
 import time
 import typing as ty
 
@@ -110,6 +111,31 @@ def test_run_timezone(writer: MockWriter):
     )
 
 
+def test_run_timezone_is_snapshot(writer: MockWriter):
+    ts = time.time()
+
+    with offset_timezone(utc_offset_hours=2):
+        run = tv.TestRun(name="test", version="1.0")
+
+    # changes in config after the run was made should not affect it
+    with offset_timezone(utc_offset_hours=4):
+        with run.scope(dut=tv.Dut(id="test_dut")):
+            step = run.add_step("step0")
+            with step.scope():
+                fan_speed = step.start_measurement_series(name="fan_speed")
+                fan_speed.add_measurement(value=1200, timestamp=ts)
+                fan_speed.add_measurement(value=1200, timestamp=ts, metadata=tv.Metadata())
+
+    assert len(writer.lines) == 8
+    for line in writer.lines:
+        assert_json(line, IgnoreAssert())
+        assert ty.cast(str, json.loads(line)["timestamp"]).endswith("+02:00")
+
+    for index in (4, 5):
+        element = ty.cast(ty.Dict[str, ty.Any], writer.decoded_obj(index))
+        assert element["testStepArtifact"]["measurementSeriesElement"]["timestamp"].endswith("+02:00")
+
+
 def test_run_skip_by_exception(writer: MockWriter):
     run = tv.TestRun(name="run_skip", version="1.0")
 
@@ -835,6 +861,54 @@ def test_step_produces_measurement_series(writer: MockWriter):
     )
 
 
+def test_step_produces_measurement_series_with_metadata(writer: MockWriter):
+    ts = time.time()
+
+    run = tv.TestRun(name="test", version="1.0")
+    with run.scope(dut=tv.Dut(id="test_dut")):
+        step = run.add_step("step0")
+        with step.scope():
+            fan_speed = step.start_measurement_series(name="fan_speed", unit="rpm")
+            with fan_speed.scope():
+                fan_speed.add_measurement(value=1200, timestamp=ts, metadata=tv.Metadata({"sensor": "tach0"}))
+                fan_speed.add_measurement(value=1500, timestamp=ts)
+
+    assert len(writer.lines) == 9
+    assert_json(
+        writer.lines[4],
+        {
+            "testStepArtifact": {
+                "measurementSeriesElement": {
+                    "index": 0,
+                    "value": 1200,
+                    "timestamp": format_timestamp(ts),
+                    "measurementSeriesId": "0_0",
+                    "metadata": {"sensor": "tach0"},
+                },
+                "testStepId": "0",
+            },
+            "sequenceNumber": 4,
+            "timestamp": IgnoreAssert(),
+        },
+    )
+    assert_json(
+        writer.lines[5],
+        {
+            "testStepArtifact": {
+                "measurementSeriesElement": {
+                    "index": 1,
+                    "value": 1500,
+                    "timestamp": format_timestamp(ts),
+                    "measurementSeriesId": "0_0",
+                },
+                "testStepId": "0",
+            },
+            "sequenceNumber": 5,
+            "timestamp": IgnoreAssert(),
+        },
+    )
+
+
 def test_step_produces_concurrent_measurement_series(writer: MockWriter):
     ts = time.time()
 
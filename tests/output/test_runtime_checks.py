@@ -191,3 +191,44 @@ def test_unknown_generic_alias():
     with pytest.raises(ValueError, match=re.escape("unsupported")):
         a = A(f1="f1")  # type: ignore
         check_field_types(a)
+
+
+def test_failure_with_unchecked_fields():
+    @dc.dataclass
+    class A:
+        f1: ty.List
+        f2: ty.Dict
+        f3: ty.Any
+        f4: ty.Optional[ty.Any]
+        f5: int
+
+    a = A(f1=[1], f2={"2": "2"}, f3=3, f4=4, f5=5)
+    check_field_types(a)
+
+    with pytest.raises(TypeCheckError, match=re.escape("A.f5")):
+        a = A(f1=[1], f2={"2": "2"}, f3=3, f4=4, f5="5")  # type: ignore
+        check_field_types(a)
+
+
+def test_checked_objects_are_not_checked_again():
+    @dc.dataclass
+    class B:
+        f1: int
+
+        def __post_init__(self):
+            check_field_types(self)
+
+    @dc.dataclass
+    class A:
+        f1: ty.List[B]
+
+    b = B(f1=1)
+    # not actually correct, but this shows that the nested object isn't checked again
+    b.f1 = "1"  # type: ignore
+    check_field_types(A(f1=[b]))
+
+    # objects not checked at construction are still checked when nested
+    c = B.__new__(B)
+    c.f1 = "1"  # type: ignore
+    with pytest.raises(TypeCheckError, match=re.escape("A.f1 -> List[0] -> B.f1")):
+        check_field_types(A(f1=[c]))
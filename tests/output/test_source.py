@@ -1,10 +1,159 @@
+import inspect
 import sys
 
+import pytest
+
+import ocptv.output as tv
+from ocptv.output import DiagnosisType, LogSeverity, source
 from ocptv.output.source import NullSourceLocation, get_caller_source
 
+from .conftest import MockWriter, source_location_policy
+
 
 def test_get_caller_source_with_bad_index():
     value = get_caller_source(offset=sys.maxsize)
 
     assert isinstance(value, NullSourceLocation)
     assert value.to_spec() is None
+
+
+def test_get_caller_source_location():
+    def lib_function():
+        return get_caller_source()
+
+    value = lib_function()
+    line = sys._getframe().f_lineno - 1
+
+    spec = value.to_spec()
+    assert spec is not None
+    assert spec.file == __file__
+    assert spec.line == line
+
+
+def test_get_caller_source_is_interned():
+    def lib_function():
+        return get_caller_source()
+
+    values = [lib_function() for _ in range(2)]
+    other = lib_function()
+
+    assert values[0] is values[1]
+    assert values[0] is not other
+
+
+def test_get_caller_source_cache_is_bounded(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(source, "_MAX_CALLSITES", 1)
+    monkeypatch.setattr(source, "_callsites", {})
+
+    def lib_function():
+        return get_caller_source()
+
+    def user_function():
+        return lib_function()
+
+    first = user_function()
+    assert user_function() is first
+
+    # a different callsite resets the cache, so the first one is made anew
+    lib_function()
+    assert len(source._callsites) == 1
+    assert user_function() is not first
+
+
+def test_policy_always_captures_caller(writer: MockWriter):
+    run = tv.TestRun(name="test", version="1.0")
+    run.start(dut=tv.Dut(id="test_dut"))
+
+    line = inspect.currentframe().f_lineno + 1  # type: ignore
+    run.add_log(LogSeverity.DEBUG, "log")
+
+    obj = writer.decoded_obj(2)
+    assert obj["testRunArtifact"]["log"]["sourceLocation"] == {  # type: ignore
+        "file": __file__,
+        "line": line,
+    }
+
+
+def test_policy_never_skips_capture(writer: MockWriter):
+    with source_location_policy(tv.SourceLocationPolicy.NEVER):
+        run = tv.TestRun(name="test", version="1.0")
+
+    run.start(dut=tv.Dut(id="test_dut"))
+    run.add_log(LogSeverity.FATAL, "log")
+    run.add_error(symptom="symptom")
+
+    step = run.add_step("step")
+    step.add_log(LogSeverity.ERROR, "log")
+    step.add_error(symptom="symptom")
+    step.add_diagnosis(DiagnosisType.FAIL, verdict="verdict")
+
+    # explicit locations are unaffected by the policy
+    step.add_log(LogSeverity.INFO, "log", source_location=tv.SourceLocation("file", 42))
+
+    artifacts = [writer.decoded_obj(i) for i in range(2, len(writer.lines))]
+    assert "sourceLocation" not in artifacts[0]["testRunArtifact"]["log"]  # type: ignore
+    assert "sourceLocation" not in artifacts[1]["testRunArtifact"]["error"]  # type: ignore
+    assert "sourceLocation" not in artifacts[2]["testStepArtifact"]["log"]  # type: ignore
+    assert "sourceLocation" not in artifacts[3]["testStepArtifact"]["error"]  # type: ignore
+    assert "sourceLocation" not in artifacts[4]["testStepArtifact"]["diagnosis"]  # type: ignore
+    assert artifacts[5]["testStepArtifact"]["log"]["sourceLocation"] == {  # type: ignore
+        "file": "file",
+        "line": 42,
+    }
+
+
+def test_policy_errors_only(writer: MockWriter):
+    with source_location_policy(tv.SourceLocationPolicy.ERRORS_ONLY):
+        run = tv.TestRun(name="test", version="1.0")
+
+    run.start(dut=tv.Dut(id="test_dut"))
+    run.add_log(LogSeverity.WARNING, "log")
+    run.add_log(LogSeverity.ERROR, "log")
+    run.add_error(symptom="symptom")
+
+    step = run.add_step("step")
+    step.add_log(LogSeverity.INFO, "log")
+    step.add_log(LogSeverity.FATAL, "log")
+    step.add_error(symptom="symptom")
+    step.add_diagnosis(DiagnosisType.PASS, verdict="verdict")
+
+    captured = []
+    for i in range(2, len(writer.lines)):
+        artifact = writer.decoded_obj(i)
+        impl = artifact.get("testRunArtifact", artifact.get("testStepArtifact"))
+        for kind in ("log", "error", "diagnosis"):
+            if kind in impl:  # type: ignore
+                captured.append("sourceLocation" in impl[kind])  # type: ignore
+
+    assert captured == [False, True, True, False, True, True, True]
+
+
+def test_policy_sampled(writer: MockWriter):
+    with source_location_policy(tv.SourceLocationPolicy.sampled(3)):
+        run = tv.TestRun(name="test", version="1.0")
+
+    run.start(dut=tv.Dut(id="test_dut"))
+    for _ in range(7):
+        run.add_log(LogSeverity.DEBUG, "log")
+
+    captured = ["sourceLocation" in writer.decoded_obj(i)["testRunArtifact"]["log"] for i in range(2, 9)]  # type: ignore
+    assert captured == [True, False, False, True, False, False, True]
+
+
+def test_policy_sampled_bad_interval():
+    with pytest.raises(ValueError):
+        tv.SourceLocationPolicy.sampled(0)
+
+
+def test_policy_is_committed_on_run(writer: MockWriter):
+    run = tv.TestRun(name="test", version="1.0")
+    with source_location_policy(tv.SourceLocationPolicy.NEVER):
+        run.start(dut=tv.Dut(id="test_dut"))
+        run.add_log(LogSeverity.DEBUG, "log")
+
+    assert "sourceLocation" in writer.decoded_obj(2)["testRunArtifact"]["log"]  # type: ignore
+
+
+def test_policy_repr():
+    assert repr(tv.SourceLocationPolicy.ERRORS_ONLY) == "SourceLocationPolicy.ERRORS_ONLY"
+    assert repr(tv.SourceLocationPolicy.sampled(10)) == "SourceLocationPolicy.sampled(10)"
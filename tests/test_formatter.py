@@ -1,7 +1,14 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta, timezone, tzinfo
 from enum import Enum
 
-from ocptv.formatter import format_enum, format_timestamp
+import pytest
+
+from ocptv.formatter import (
+    TimestampFormatter,
+    format_enum,
+    format_timestamp,
+    get_timestamp_formatter,
+)
 
 
 def test_format_enum_simple():
@@ -28,3 +35,30 @@ def test_format_timestamp_simple():
 
 def test_format_timestamp_zulu():
     assert format_timestamp(0, tz=timezone.utc) == "1970-01-01T00:00:00Z"
+
+
+@pytest.mark.parametrize(
+    "tz",
+    [
+        timezone.utc,
+        timezone(offset=timedelta(hours=1), name="plus1"),
+        timezone(offset=timedelta(hours=-5, minutes=-30)),
+    ],
+)
+@pytest.mark.parametrize(
+    "ts",
+    [0, 0.5, 1577934245.0001, 1577934245.9999996, 1577934245.0000004, -1.5, -0.0000004, 4102444800.123456],
+)
+def test_timestamp_formatter_same_as_format_timestamp(ts: float, tz: tzinfo):
+    formatter = TimestampFormatter(tz)
+
+    assert formatter.format(ts) == format_timestamp(ts, tz=tz)
+    # second call uses the cached second
+    assert formatter.format(ts) == format_timestamp(ts, tz=tz)
+
+
+def test_get_timestamp_formatter_is_shared():
+    tz = timezone(offset=timedelta(hours=2))
+
+    assert get_timestamp_formatter(tz) is get_timestamp_formatter(tz)
+    assert get_timestamp_formatter(tz) is not get_timestamp_formatter(timezone.utc)